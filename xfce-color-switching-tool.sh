@@ -26,9 +26,8 @@ LAST_APPLY_PICOM_CONF=""
 LAST_APPLY_MENU_OPACITY=""
 LAST_APPLY_PANEL_ALPHA=""
 LAST_APPLY_FRAME_OPACITY=""
-LAST_RESTART_MESSAGE=""
-LAST_RESTART_PANEL_STATUS=""
-LAST_RESTART_XFWM_STATUS=""
+LAST_APPLY_TRANSPARENCY_CHANGED=0
+RESTART_PID=""
 MANIFEST_NAME=".xpm_color_targets.json"
 XFWM4_DIR_NAME="xfwm4"
 ORIGINAL_THEME_TARGET="#ff0000"
@@ -37,6 +36,17 @@ LAST_APPLY_THEME_COLOR=""
 LAST_APPLY_MANIFEST=""
 LAST_APPLY_COLOR_MESSAGE=""
 LAST_APPLY_COLOR_FILES=""
+# Theme root and color written by the last successful apply in this session.
+APPLIED_THEME_ROOT=""
+APPLIED_THEME_COLOR=""
+# Panel CSS and menu opacity written by the last successful transparency apply.
+APPLIED_PANEL_CSS=""
+APPLIED_MENU_OPACITY=""
+PANEL_XFCONF_LISTING=""
+# Config file content written by the last save_config in this session.
+LAST_WRITTEN_CONFIG=""
+# Property path -> value, parsed from PANEL_XFCONF_LISTING.
+declare -A PANEL_XFCONF_VALUES=()
 
 
 # -----------------------------
@@ -169,14 +179,23 @@ clamp_hue() {
   printf '%d' "$value"
 }
 
-clamp_rgb() {
-  local value="$1"
+# Steps the slider variable named $1 by $2 within 0..$3 and re-syncs the
+# palette cursor, without the clamp subshell per keypress.
+adjust_slider() {
+  local name="$1" delta="$2" max_value="$3"
+  local value=$(( ${!name} + delta ))
+
   (( value < 0 )) && value=0
-  (( value > 255 )) && value=255
-  printf '%d' "$value"
+  (( value > max_value )) && value=$max_value
+  printf -v "$name" '%d' "$value"
+  disable_custom_color_mode
+  sync_palette_cursor_with_current
 }
 
 cleanup() {
+  # Let a pending panel/xfwm4 restart finish; quitting (and closing the
+  # terminal) mid-restart could leave the session without a panel.
+  wait_for_restart
   if [[ -n "${stty_state:-}" ]]; then
     stty "$stty_state" 2>/dev/null || true
   else
@@ -209,6 +228,20 @@ palette_names_de=(
   "Pink" "Rouge" "Violett" "Lavendel" "Taupe" "Schokoladenbraun" "Schiefer" "Frost"
 )
 
+# Translations already looked up, keyed by "lang:key". Render code reads
+# them through tr_assign so each string costs one subshell per session
+# instead of one per frame.
+declare -A tr_cache=()
+
+tr_assign() {
+  local cache_key="$ui_lang:$2"
+
+  if [[ -z "${tr_cache["$cache_key"]+set}" ]]; then
+    tr_cache["$cache_key"]=$(tr_text "$2")
+  fi
+  printf -v "$1" '%s' "${tr_cache["$cache_key"]}"
+}
+
 tr_text() {
   local key="$1"
   case "$ui_lang:$key" in
@@ -439,20 +472,45 @@ load_config() {
 }
 
 save_config() {
-  mkdir -p "$CONFIG_DIR"
-  cat > "$CONFIG_FILE" <<CFG
-UI_LANG=$ui_lang
-HAS_SAVED_STATE=1
-SAVED_SELECTED=$last_saved_selected
-SAVED_TRANSPARENCY=$last_saved_transparency
-SAVED_SHOW_MIXER=$last_saved_show_mixer
-SAVED_INTENSITY=$last_saved_intensity
-SAVED_HUE=$last_saved_hue
-SAVED_SATURATION=$last_saved_saturation
-SAVED_BRIGHTNESS=$last_saved_brightness
-SAVED_CUSTOM_COLOR_ENABLED=$last_saved_custom_color_enabled
-SAVED_CUSTOM_COLOR_HEX=$last_saved_custom_color_hex
-CFG
+  local content
+  local target
+  local temp_file
+
+  printf -v content '%s\n' \
+    "UI_LANG=$ui_lang" \
+    "HAS_SAVED_STATE=1" \
+    "SAVED_SELECTED=$last_saved_selected" \
+    "SAVED_TRANSPARENCY=$last_saved_transparency" \
+    "SAVED_SHOW_MIXER=$last_saved_show_mixer" \
+    "SAVED_INTENSITY=$last_saved_intensity" \
+    "SAVED_HUE=$last_saved_hue" \
+    "SAVED_SATURATION=$last_saved_saturation" \
+    "SAVED_BRIGHTNESS=$last_saved_brightness" \
+    "SAVED_CUSTOM_COLOR_ENABLED=$last_saved_custom_color_enabled" \
+    "SAVED_CUSTOM_COLOR_HEX=$last_saved_custom_color_hex"
+
+  # Saving identical settings again is a no-op.
+  [[ "$content" == "$LAST_WRITTEN_CONFIG" && -f "$CONFIG_FILE" ]] && return 0
+
+  [[ -d "$CONFIG_DIR" ]] || mkdir -p "$CONFIG_DIR"
+  # Write beside the real file and rename, so a crash never leaves a torn
+  # file. A symlinked config (dotfile managers) keeps its link, and an
+  # existing file keeps its mode.
+  target=$(readlink -f -- "$CONFIG_FILE" 2>/dev/null) || target=""
+  [[ -n "$target" ]] || target="$CONFIG_FILE"
+  temp_file="$target.tmp.$$"
+  if ! printf '%s' "$content" > "$temp_file"; then
+    rm -f "$temp_file"
+    return 1
+  fi
+  if [[ -e "$target" ]]; then
+    chmod --reference="$target" -- "$temp_file" 2>/dev/null || true
+  fi
+  if ! mv -f "$temp_file" "$target"; then
+    rm -f "$temp_file"
+    return 1
+  fi
+  LAST_WRITTEN_CONFIG="$content"
 }
 
 clamp_palette_index() {
@@ -462,16 +520,17 @@ clamp_palette_index() {
   printf '%d' "$value"
 }
 
-find_matching_preset_index() {
-  local match=-1
-  local i
+index_preset_values() {
+  local i key
+  preset_index_by_values=()
   for i in "${!preset_intensity_values[@]}"; do
-    if (( intensity == preset_intensity_values[i] && hue == preset_hue_values[i] && saturation == preset_saturation_values[i] && brightness == preset_brightness_values[i] )); then
-      match=$i
-      break
-    fi
+    key="${preset_intensity_values[i]} ${preset_hue_values[i]} ${preset_saturation_values[i]} ${preset_brightness_values[i]}"
+    [[ -n "${preset_index_by_values[$key]:-}" ]] || preset_index_by_values[$key]=$i
   done
-  printf '%d' "$match"
+}
+
+find_matching_preset_index() {
+  printf '%d' "${preset_index_by_values["$intensity $hue $saturation $brightness"]:--1}"
 }
 
 sync_palette_cursor_with_current() {
@@ -481,7 +540,7 @@ sync_palette_cursor_with_current() {
     return 0
   fi
 
-  preset_match=$(find_matching_preset_index)
+  preset_match=${preset_index_by_values["$intensity $hue $saturation $brightness"]:--1}
   if (( preset_match >= 0 )); then
     palette_cursor="$preset_match"
   else
@@ -502,9 +561,10 @@ normalize_html_hex() {
 }
 
 html_hex_to_rgb() {
-  local value=""
-  value=$(normalize_html_hex "$1") || return 1
-  printf '%d %d %d' "0x${value:1:2}" "0x${value:3:2}" "0x${value:5:2}"
+  local value="${1:-}"
+  value="${value//[$'\r\n\t ']/}"
+  [[ "$value" =~ ^#?([0-9a-fA-F]{2})([0-9a-fA-F]{2})([0-9a-fA-F]{2})$ ]] || return 1
+  printf '%d %d %d' "0x${BASH_REMATCH[1]}" "0x${BASH_REMATCH[2]}" "0x${BASH_REMATCH[3]}"
 }
 
 disable_custom_color_mode() {
@@ -673,50 +733,35 @@ preset_brightness_values=(
   100 98 63 58 59 30 33 98
 )
 
+# First preset index for each "intensity hue saturation brightness" tuple.
+declare -A preset_index_by_values=()
 palette_colors=()
+declare -A preview_color_cache=()
+preview_color_code=""
 
-component_to_cube_idx() {
-  local value="$1"
-  if (( value < 48 )); then
-    printf '0'
-  elif (( value < 115 )); then
-    printf '1'
-  elif (( value < 155 )); then
-    printf '2'
-  elif (( value < 195 )); then
-    printf '3'
-  elif (( value < 235 )); then
-    printf '4'
-  else
-    printf '5'
-  fi
-}
+# Levels of the xterm-256 6x6x6 color cube, indexed by cube coordinate.
+XTERM_CUBE_LEVELS=(0 95 135 175 215 255)
 
-cube_value_from_idx() {
-  local idx="$1"
-  case "$idx" in
-    0) printf '0' ;;
-    1) printf '95' ;;
-    2) printf '135' ;;
-    3) printf '175' ;;
-    4) printf '215' ;;
-    *) printf '255' ;;
-  esac
-}
+# Result slots of the compute_* helpers. They run in the current shell, so
+# bulk callers such as update_palette_colors avoid a subshell per color.
+hsv_rgb=(0 0 0)
+preview_rgb=(0 0 0)
+xterm_color=0
 
-rgb_to_xterm() {
+compute_xterm_color() {
   local r="$1" g="$2" b="$3"
   local ri gi bi cube_r cube_g cube_b cube_color cube_dist
   local avg gray_idx gray_level gray_color gray_dist
   local dr dg db
 
-  ri=$(component_to_cube_idx "$r")
-  gi=$(component_to_cube_idx "$g")
-  bi=$(component_to_cube_idx "$b")
+  # Nearest cube coordinate: 0-47 -> 0, 48-114 -> 1, then one step per 40.
+  ri=$(( r < 48 ? 0 : r < 115 ? 1 : (r - 35) / 40 ))
+  gi=$(( g < 48 ? 0 : g < 115 ? 1 : (g - 35) / 40 ))
+  bi=$(( b < 48 ? 0 : b < 115 ? 1 : (b - 35) / 40 ))
 
-  cube_r=$(cube_value_from_idx "$ri")
-  cube_g=$(cube_value_from_idx "$gi")
-  cube_b=$(cube_value_from_idx "$bi")
+  cube_r=${XTERM_CUBE_LEVELS[ri]}
+  cube_g=${XTERM_CUBE_LEVELS[gi]}
+  cube_b=${XTERM_CUBE_LEVELS[bi]}
   cube_color=$((16 + 36 * ri + 6 * gi + bi))
 
   dr=$((r - cube_r))
@@ -741,13 +786,13 @@ rgb_to_xterm() {
   gray_dist=$((dr * dr + dg * dg + db * db))
 
   if (( gray_dist < cube_dist )); then
-    printf '%d' "$gray_color"
+    xterm_color=$gray_color
   else
-    printf '%d' "$cube_color"
+    xterm_color=$cube_color
   fi
 }
 
-hsv_to_rgb() {
+compute_hsv_rgb() {
   local hue_value="$1" saturation_value="$2" brightness_value="$3"
   local h_scaled sector frac v s c x m
   local r g b
@@ -763,7 +808,7 @@ hsv_to_rgb() {
   s=$((saturation_value * 255 / 100))
 
   if (( s <= 0 )); then
-    printf '%d %d %d' "$v" "$v" "$v"
+    hsv_rgb=("$v" "$v" "$v")
     return 0
   fi
 
@@ -789,101 +834,96 @@ hsv_to_rgb() {
     *) r=$c; g=0; b=$x ;;
   esac
 
-  r=$((r + m))
-  g=$((g + m))
-  b=$((b + m))
-
-  printf '%d %d %d' "$r" "$g" "$b"
+  hsv_rgb=($((r + m)) $((g + m)) $((b + m)))
 }
 
 rgb_to_hsv() {
-  local red_value="$1" green_value="$2" blue_value="$3"
-
-  awk -v r="$red_value" -v g="$green_value" -v b="$blue_value" '
-    BEGIN {
-      rf = r / 255.0
-      gf = g / 255.0
-      bf = b / 255.0
-
-      max = rf
-      if (gf > max) max = gf
-      if (bf > max) max = bf
-
-      min = rf
-      if (gf < min) min = gf
-      if (bf < min) min = bf
-
-      delta = max - min
-      hue = 0
-
-      if (delta == 0) {
-        hue = 0
-      } else if (max == rf) {
-        hue = 60.0 * ((gf - bf) / delta)
-        if (hue < 0) hue += 360.0
-      } else if (max == gf) {
-        hue = 60.0 * (((bf - rf) / delta) + 2.0)
-      } else {
-        hue = 60.0 * (((rf - gf) / delta) + 4.0)
-      }
-
-      saturation = (max == 0 ? 0 : (delta / max) * 100.0)
-      brightness = max * 100.0
+  local r="$1" g="$2" b="$3"
+  local max=$r min=$r delta hue_num=0 hue_den=1 saturation=0
+
+  (( g > max )) && max=$g
+  (( b > max )) && max=$b
+  (( g < min )) && min=$g
+  (( b < min )) && min=$b
+  delta=$((max - min))
+
+  # Exact integer ratios; round(num / den) is (2 * num + den) / (2 * den).
+  if (( delta > 0 )); then
+    hue_den=$delta
+    if (( max == r )); then
+      hue_num=$((60 * (g - b)))
+      (( hue_num < 0 )) && hue_num=$((hue_num + 360 * delta))
+    elif (( max == g )); then
+      hue_num=$((60 * (b - r) + 120 * delta))
+    else
+      hue_num=$((60 * (r - g) + 240 * delta))
+    fi
+  fi
+  (( max > 0 )) && saturation=$(( (200 * delta + max) / (2 * max) ))
 
-      printf "%d %d %d\n", int(hue + 0.5), int(saturation + 0.5), int(brightness + 0.5)
-    }
-  '
+  printf '%d %d %d\n' \
+    $(( (2 * hue_num + hue_den) / (2 * hue_den) )) \
+    "$saturation" \
+    $(( (200 * max + 255) / 510 ))
 }
 
-calc_preview_rgb() {
+compute_preview_rgb() {
   local intensity_value="$1" hue_value="$2" saturation_value="$3" brightness_value="$4"
   local r g b gray
 
-  read -r r g b <<< "$(hsv_to_rgb "$hue_value" "$saturation_value" "$brightness_value")"
+  compute_hsv_rgb "$hue_value" "$saturation_value" "$brightness_value"
+  r=${hsv_rgb[0]}
+  g=${hsv_rgb[1]}
+  b=${hsv_rgb[2]}
   gray=$((brightness_value * 255 / 100))
 
   r=$((gray + (r - gray) * intensity_value / 100))
   g=$((gray + (g - gray) * intensity_value / 100))
   b=$((gray + (b - gray) * intensity_value / 100))
 
-  r=$(clamp_rgb "$r")
-  g=$(clamp_rgb "$g")
-  b=$(clamp_rgb "$b")
+  r=$(( r < 0 ? 0 : r > 255 ? 255 : r ))
+  g=$(( g < 0 ? 0 : g > 255 ? 255 : g ))
+  b=$(( b < 0 ? 0 : b > 255 ? 255 : b ))
 
-  printf '%d %d %d' "$r" "$g" "$b"
+  preview_rgb=("$r" "$g" "$b")
 }
 
-calc_preview_color_code() {
-  local intensity_value="$1" hue_value="$2" saturation_value="$3" brightness_value="$4"
-  local r g b
-
-  read -r r g b <<< "$(calc_preview_rgb "$intensity_value" "$hue_value" "$saturation_value" "$brightness_value")"
-  rgb_to_xterm "$r" "$g" "$b"
-}
-
-get_effective_preview_rgb() {
+# Sets preview_color_code for the working color. Results are memoized per
+# input combination, so redraws and revisited slider values skip the forks.
+update_effective_preview_color_code() {
+  local key r g b
   if (( custom_color_enabled )); then
-    html_hex_to_rgb "$custom_color_hex"
+    key="$custom_color_hex"
   else
-    calc_preview_rgb "$intensity" "$hue" "$saturation" "$brightness"
+    key="$intensity $hue $saturation $brightness"
   fi
-}
 
-get_effective_preview_color_code() {
-  local r g b
-  read -r r g b <<< "$(get_effective_preview_rgb)"
-  rgb_to_xterm "$r" "$g" "$b"
+  if [[ -z "${preview_color_cache[$key]:-}" ]]; then
+    if (( custom_color_enabled )); then
+      read -r r g b <<< "$(html_hex_to_rgb "$custom_color_hex")"
+    else
+      compute_preview_rgb "$intensity" "$hue" "$saturation" "$brightness"
+      r=${preview_rgb[0]}
+      g=${preview_rgb[1]}
+      b=${preview_rgb[2]}
+    fi
+    compute_xterm_color "$r" "$g" "$b"
+    preview_color_cache[$key]=$xterm_color
+  fi
+  preview_color_code="${preview_color_cache[$key]}"
 }
 
 update_palette_colors() {
   local i
   palette_colors=()
   for i in "${!palette_names_en[@]}"; do
-    palette_colors[i]=$(calc_preview_color_code \
+    compute_preview_rgb \
       "${preset_intensity_values[i]}" \
       "${preset_hue_values[i]}" \
       "${preset_saturation_values[i]}" \
-      "${preset_brightness_values[i]}")
+      "${preset_brightness_values[i]}"
+    compute_xterm_color "${preview_rgb[@]}"
+    palette_colors[i]=$xterm_color
   done
 }
 
@@ -1051,6 +1091,7 @@ button_index=0       # 0 = Save, 1 = Cancel
 focus=0
 result="quit"
 need_relayout=1
+last_render_signature=""
 auto_resize_message=""
 auto_resize_runs=0
 auto_resize_method="-"
@@ -1277,14 +1318,16 @@ render_background() {
 }
 
 render_dialog_shell() {
-  local title="$(tr_text title)"
+  local title desc
+  tr_assign title title
+  tr_assign desc desc
   local title_col=$((dlg_c + (dlg_w - ${#title}) / 2))
 
   shadow_box "$dlg_r" "$dlg_c" "$dlg_w" "$dlg_h"
   box "$dlg_r" "$dlg_c" "$dlg_w" "$dlg_h" "$CLR_DIALOG_BORDER" "$CLR_DIALOG_BG"
 
   write_at "$dlg_r" "$title_col" "$CLR_DIALOG_BG" "$CLR_DIALOG_TITLE" " $title "
-  write_at $((dlg_r + 2)) $((dlg_c + 3)) "$CLR_DIALOG_BG" "$CLR_TEXT" "$(tr_text desc)"
+  write_at $((dlg_r + 2)) $((dlg_c + 3)) "$CLR_DIALOG_BG" "$CLR_TEXT" "$desc"
 
   hline $((dlg_r + dlg_h - 4)) $((dlg_c + 1)) $((dlg_w - 2)) "$CLR_DIALOG_BG" "$CLR_DIALOG_BORDER" '─'
 }
@@ -1294,7 +1337,8 @@ render_palette() {
   local idx row col rr cc border_color fill_color box_bg inset_col inset_w
   local preview_color preset_match
 
-  preview_color=$(get_effective_preview_color_code)
+  update_effective_preview_color_code
+  preview_color="$preview_color_code"
   preset_match=$(find_matching_preset_index)
 
   for row in 0 1; do
@@ -1327,7 +1371,9 @@ render_palette() {
     done
   done
 
-  write_at $((dlg_r + 12)) $((dlg_c + 4)) "$CLR_DIALOG_BG" "$CLR_TEXT" "$(tr_text current_color) $(current_color_name)"
+  local current_color_label
+  tr_assign current_color_label current_color
+  write_at $((dlg_r + 12)) $((dlg_c + 4)) "$CLR_DIALOG_BG" "$CLR_TEXT" "$current_color_label $(current_color_name)"
 
   box $((dlg_r + 11)) $((dlg_c + dlg_w - 12)) 8 3 "$CLR_SWATCH_BORDER" "$CLR_DIALOG_BG"
   fill_rect $((dlg_r + 12)) $((dlg_c + dlg_w - 11)) 6 1 "$preview_color"
@@ -1367,6 +1413,10 @@ render_slider_row() {
   local bar_w=34
   local value_col=$((dlg_c + 60))
   local knob_pos=$(( value * (bar_w - 1) / max_value ))
+  local track_fg="${CSI}38;5;${CLR_TRACK_FG}m"
+  local filled_fg="${CSI}38;5;${CLR_TRACK_FILLED}m"
+  local knob_fg="${CSI}38;5;255m"
+  local bar=""
   local i
 
   if (( active )); then
@@ -1375,25 +1425,22 @@ render_slider_row() {
     write_at "$row" "$label_col" "$CLR_DIALOG_BG" "$CLR_TEXT" "$(pad_right 16 "$label")"
   fi
 
-  move "$row" "$bar_col"
-  bg "$CLR_TRACK_BG"; fg "$CLR_TRACK_FG"
+  (( active )) && knob_fg="${CSI}38;5;${CLR_BUTTON_ACTIVE_FG}m"
+
+  # Assemble the whole track first and emit it with a single write.
   for ((i=0; i<bar_w; i++)); do
     if (( i < knob_pos )); then
-      fg "$CLR_TRACK_FILLED"
-      printf '─'
-      fg "$CLR_TRACK_FG"
+      bar+="${filled_fg}─${track_fg}"
     elif (( i == knob_pos )); then
-      if (( active )); then
-        fg "$CLR_BUTTON_ACTIVE_FG"
-      else
-        fg 255
-      fi
-      printf '◆'
-      fg "$CLR_TRACK_FG"
+      bar+="${knob_fg}◆${track_fg}"
     else
-      printf '─'
+      bar+="─"
     fi
   done
+
+  move "$row" "$bar_col"
+  bg "$CLR_TRACK_BG"; fg "$CLR_TRACK_FG"
+  printf '%s' "$bar"
   reset_style
 
   if (( active )); then
@@ -1404,17 +1451,23 @@ render_slider_row() {
 }
 
 render_mixer() {
-  local mixer_label="$(tr_text hide_color_mixer)"
-  (( show_mixer == 0 )) && mixer_label="$(tr_text show_color_mixer)"
+  local mixer_label transparency_label intensity_label hue_label saturation_label brightness_label
+  tr_assign mixer_label hide_color_mixer
+  (( show_mixer == 0 )) && tr_assign mixer_label show_color_mixer
+  tr_assign transparency_label enable_transparency
+  tr_assign intensity_label color_intensity
 
-  render_checkbox   $((dlg_r + 14)) "$(tr_text enable_transparency)" "$transparency" $(( focus == 1 ))
+  render_checkbox   $((dlg_r + 14)) "$transparency_label" "$transparency" $(( focus == 1 ))
   render_link_row   $((dlg_r + 16)) "$mixer_label" $(( focus == 3 ))
-  render_slider_row $((dlg_r + 18)) "$(tr_text color_intensity)" "$intensity" $(( focus == 2 )) 100
+  render_slider_row $((dlg_r + 18)) "$intensity_label" "$intensity" $(( focus == 2 )) 100
 
   if (( show_mixer )); then
-    render_slider_row $((dlg_r + 20)) "$(tr_text hue)" "$hue" $(( focus == 4 )) 360
-    render_slider_row $((dlg_r + 21)) "$(tr_text saturation)" "$saturation" $(( focus == 5 )) 100
-    render_slider_row $((dlg_r + 22)) "$(tr_text brightness)" "$brightness" $(( focus == 6 )) 100
+    tr_assign hue_label hue
+    tr_assign saturation_label saturation
+    tr_assign brightness_label brightness
+    render_slider_row $((dlg_r + 20)) "$hue_label" "$hue" $(( focus == 4 )) 360
+    render_slider_row $((dlg_r + 21)) "$saturation_label" "$saturation" $(( focus == 5 )) 100
+    render_slider_row $((dlg_r + 22)) "$brightness_label" "$brightness" $(( focus == 6 )) 100
     paint_line $((dlg_r + 23)) $((dlg_c + 2)) $((dlg_w - 4)) "$CLR_DIALOG_BG"
   else
     paint_line $((dlg_r + 20)) $((dlg_c + 2)) $((dlg_w - 4)) "$CLR_DIALOG_BG"
@@ -1446,8 +1499,11 @@ render_action_status() {
 
 render_buttons() {
   local row=$((dlg_r + dlg_h - 2))
-  local save_label="[ $(tr_text save_changes) ]"
-  local cancel_label="[ $(tr_text cancel) ]"
+  local save_label cancel_label
+  tr_assign save_label save_changes
+  tr_assign cancel_label cancel
+  save_label="[ $save_label ]"
+  cancel_label="[ $cancel_label ]"
   local save_col=$((dlg_c + dlg_w / 2 - ${#save_label} - 3))
   local cancel_col=$((dlg_c + dlg_w / 2 + 4))
 
@@ -1465,13 +1521,16 @@ render_buttons() {
 }
 
 render_footer_hint() {
-  local footer="$(tr_text language_hotkey_footer)"
+  local footer
+  tr_assign footer language_hotkey_footer
   paint_line "$rows" 1 "$cols" "$CLR_SCREEN_BG"
   write_at "$rows" 2 "$CLR_SCREEN_BG" 255 "$footer"
 }
 
 render_status() {
-  local status="$(tr_text auto_size) ${auto_resize_message}"
+  local status
+  tr_assign status auto_size
+  status+=" ${auto_resize_message}"
   local col=$((cols - ${#status} - 2))
   (( col < 2 )) && col=2
   write_at 1 "$col" "$CLR_SCREEN_BG" "$CLR_HEADER_CYAN" "$status"
@@ -1480,9 +1539,10 @@ render_status() {
 render_language_dialog() {
   (( language_dialog_open )) || return 0
 
-  local title="$(tr_text language_dialog_title)"
-  local desc="$(tr_text language_dialog_desc)"
-  local hint="$(tr_text language_dialog_hint)"
+  local title desc hint
+  tr_assign title language_dialog_title
+  tr_assign desc language_dialog_desc
+  tr_assign hint language_dialog_hint
   local win_w=$LANG_DIALOG_W
   local min_w=$(( ${#title} + 8 ))
   (( ${#desc} + 6 > min_w )) && min_w=$(( ${#desc} + 6 ))
@@ -1500,8 +1560,11 @@ render_language_dialog() {
   local opt0="1  English"
   local opt1="2  Deutsch"
   local btn_row=$((win_r + win_h - 2))
-  local ok_label="[ $(tr_text ok) ]"
-  local cancel_label="[ $(tr_text cancel) ]"
+  local ok_label cancel_label
+  tr_assign ok_label ok
+  tr_assign cancel_label cancel
+  ok_label="[ $ok_label ]"
+  cancel_label="[ $cancel_label ]"
   local ok_col=$((win_c + win_w / 2 - ${#ok_label} - 3))
   local cancel_col=$((win_c + win_w / 2 + 4))
 
@@ -1543,9 +1606,11 @@ render_language_dialog() {
 render_value_dialog() {
   (( value_dialog_open )) || return 0
 
-  local title="$(tr_text set_value)"
-  local value_for_line="$(tr_text value_for) $value_dialog_label"
-  local hint="$(tr_text "$value_dialog_hint_key")"
+  local title value_for_line hint
+  tr_assign title set_value
+  tr_assign value_for_line value_for
+  value_for_line+=" $value_dialog_label"
+  tr_assign hint "$value_dialog_hint_key"
   local win_w=62
   local min_w=$(( ${#title} + 8 ))
   (( ${#value_for_line} + 6 > min_w )) && min_w=$(( ${#value_for_line} + 6 ))
@@ -1576,9 +1641,10 @@ render_value_dialog() {
 render_html_color_dialog() {
   (( html_color_dialog_open )) || return 0
 
-  local title="$(tr_text set_html_color)"
-  local label_line="$(tr_text html_color)"
-  local hint="$(tr_text html_color_hint)"
+  local title label_line hint
+  tr_assign title set_html_color
+  tr_assign label_line html_color
+  tr_assign hint html_color_hint
   local win_w=62
   local min_w=$(( ${#title} + 8 ))
   (( ${#label_line} + 6 > min_w )) && min_w=$(( ${#label_line} + 6 ))
@@ -1607,7 +1673,24 @@ render_html_color_dialog() {
 }
 
 render() {
-  (( need_relayout )) && get_layout
+  local signature
+
+  if (( need_relayout )); then
+    get_layout
+    last_render_signature=""
+  fi
+
+  # Keys that change nothing (LEFT at 0, TAB-cycling back, ...) leave every
+  # input of the frame untouched; skip the full repaint for them.
+  printf -v signature '%s\037' "$rows" "$cols" "$ui_lang" "$focus" "$button_index" \
+    "$palette_cursor" "$show_mixer" "$transparency" "$intensity" "$hue" "$saturation" \
+    "$brightness" "$custom_color_enabled" "$custom_color_hex" "$ACTION_STATUS_MESSAGE" \
+    "$auto_resize_message" "$language_dialog_open" "$language_focus" "$language_selected" \
+    "$language_button_index" "$value_dialog_open" "$value_dialog_input" "$value_dialog_label" \
+    "$value_dialog_hint_key" "$html_color_dialog_open" "$html_color_dialog_input"
+  [[ "$signature" == "$last_render_signature" ]] && return 0
+  last_render_signature="$signature"
+
   render_background
   render_dialog_shell
   render_palette
@@ -1883,8 +1966,8 @@ apply_action() {
 
     2) # Intensity
       case "$key" in
-        LEFT) intensity=$(clamp_percent $((intensity - 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
-        RIGHT) intensity=$(clamp_percent $((intensity + 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
+        LEFT) adjust_slider intensity -1 100 ;;
+        RIGHT) adjust_slider intensity 1 100 ;;
         SPACE|ENTER) open_value_dialog_for_focus 2 ;;
         UP) focus_prev ;;
         DOWN) focus_next ;;
@@ -1906,8 +1989,8 @@ apply_action() {
 
     4) # Hue
       case "$key" in
-        LEFT) hue=$(clamp_hue $((hue - 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
-        RIGHT) hue=$(clamp_hue $((hue + 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
+        LEFT) adjust_slider hue -1 360 ;;
+        RIGHT) adjust_slider hue 1 360 ;;
         SPACE|ENTER) open_value_dialog_for_focus 4 ;;
         UP) focus_prev ;;
         DOWN) focus_next ;;
@@ -1916,8 +1999,8 @@ apply_action() {
 
     5) # Saturation
       case "$key" in
-        LEFT) saturation=$(clamp_percent $((saturation - 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
-        RIGHT) saturation=$(clamp_percent $((saturation + 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
+        LEFT) adjust_slider saturation -1 100 ;;
+        RIGHT) adjust_slider saturation 1 100 ;;
         SPACE|ENTER) open_value_dialog_for_focus 5 ;;
         UP) focus_prev ;;
         DOWN) focus_next ;;
@@ -1926,8 +2009,8 @@ apply_action() {
 
     6) # Brightness
       case "$key" in
-        LEFT) brightness=$(clamp_percent $((brightness - 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
-        RIGHT) brightness=$(clamp_percent $((brightness + 1))); disable_custom_color_mode; sync_palette_cursor_with_current ;;
+        LEFT) adjust_slider brightness -1 100 ;;
+        RIGHT) adjust_slider brightness 1 100 ;;
         SPACE|ENTER) open_value_dialog_for_focus 6 ;;
         UP) focus_prev ;;
         DOWN) focus_next ;;
@@ -1966,13 +2049,13 @@ format_opacity_decimal() {
 }
 
 get_selected_color_hex() {
-  local red green blue
   if (( custom_color_enabled )); then
-    normalize_html_hex "$custom_color_hex"
+    # Every writer of custom_color_hex stores it normalized already.
+    printf '%s' "$custom_color_hex"
     return 0
   fi
-  read -r red green blue <<< "$(calc_preview_rgb "$intensity" "$hue" "$saturation" "$brightness")"
-  printf '#%02x%02x%02x' "$red" "$green" "$blue"
+  compute_preview_rgb "$intensity" "$hue" "$saturation" "$brightness"
+  printf '#%02x%02x%02x' "${preview_rgb[@]}"
 }
 
 resolve_theme_root() {
@@ -2003,6 +2086,7 @@ apply_theme_color_files() {
   local tmp_stdout=""
   local tmp_stderr=""
   local py_rc=0
+  local line=""
 
   LAST_APPLY_THEME_ROOT=""
   LAST_APPLY_THEME_COLOR=""
@@ -2025,6 +2109,11 @@ apply_theme_color_files() {
   LAST_APPLY_THEME_COLOR="$new_color"
   LAST_APPLY_MANIFEST="$theme_root/$MANIFEST_NAME"
 
+  if [[ "$theme_root" == "$APPLIED_THEME_ROOT" && "$new_color" == "$APPLIED_THEME_COLOR" ]]; then
+    LAST_APPLY_COLOR_MESSAGE="No color changes needed. Theme already uses $new_color."
+    return 0
+  fi
+
   tmp_stdout=$(mktemp) || {
     LAST_APPLY_COLOR_MESSAGE="Could not allocate temporary file for color patch output."
     return 1
@@ -2038,20 +2127,25 @@ apply_theme_color_files() {
   python3 - "$theme_root" "$new_color" "$ORIGINAL_THEME_TARGET" "$MANIFEST_NAME" "$PANEL_CSS_RELATIVE_PATH" "$XFWM4_DIR_NAME" >"$tmp_stdout" 2>"$tmp_stderr" <<'PY'
 from __future__ import annotations
 
+import fcntl
 import json
+import os
 import re
-import shutil
 import sys
 from pathlib import Path
 
 
 HEX_RE = re.compile(r"^#?[0-9a-fA-F]{6}$")
-QUOTED_LINE_RE = re.compile(r'^(?P<prefix>\s*")(?P<content>(?:[^"\\]|\\.)*)(?P<suffix>".*)$')
+QUOTED_LINE_RE = re.compile(r'^[^\S\n]*"(?P<content>(?:[^"\\\n]|\\.)*)".*$', re.MULTILINE)
 COLOR_VALUE_RE = re.compile(r'(\bc\s+)(\S+)', re.IGNORECASE)
 CSS_COLOR_BASE_RE = re.compile(
     r'(^\s*@define-color\s+color_base\s+)(#[0-9a-fA-F]{6})(\s*;)',
     re.IGNORECASE | re.MULTILINE,
 )
+# ioctl from linux/fs.h that shares the source extents on CoW filesystems.
+FICLONE = 0x40049409
+# Cleared after the first failed clone so later backups copy directly.
+reflink_supported = True
 
 
 class ThemeError(Exception):
@@ -2067,28 +2161,54 @@ def normalize_hex(value: str) -> str:
     return value.lower()
 
 
+def compile_color_pattern(color: str) -> re.Pattern[str]:
+    return re.compile(re.escape(color), re.IGNORECASE)
+
+
+def list_xpm_files(xpm_dir: Path) -> list[Path]:
+    # One scandir pass; the file type comes from the cached directory entry.
+    with os.scandir(xpm_dir) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".xpm") and entry.is_file()
+        ]
+    return [xpm_dir / name for name in sorted(names)]
+
+
+def clone_file(source: Path, target: Path) -> bool:
+    global reflink_supported
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            reflink_supported = False
+            # Don't leave an empty .bak behind; backup_file skips existing ones.
+            target.unlink()
+            return False
+        stat = os.fstat(src.fileno())
+        os.fchmod(dst.fileno(), stat.st_mode & 0o7777)
+        os.utime(dst.fileno(), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return True
+
+
 def backup_file(path: Path) -> None:
     backup = path.with_suffix(path.suffix + ".bak")
     if not backup.exists():
-        shutil.copy2(path, backup)
-
+        if reflink_supported and clone_file(path, backup):
+            return
+        # Imported here: backups already exist after the first apply, and
+        # shutil pulls in several modules at startup.
+        import shutil
 
-def extract_xpm_table(lines: list[str]) -> tuple[int, int, list[int], list[str]]:
-    quoted_indexes: list[int] = []
-    quoted_contents: list[str] = []
-
-    for index, line in enumerate(lines):
-        match = QUOTED_LINE_RE.match(line.rstrip("\n"))
-        if match:
-            quoted_indexes.append(index)
-            quoted_contents.append(match.group("content"))
+        shutil.copy2(path, backup)
 
-    if not quoted_contents:
-        raise ThemeError("No XPM data lines found.")
 
-    header_parts = quoted_contents[0].split()
+def parse_xpm_header(header: str) -> tuple[int, int, int]:
+    header_parts = header.split()
     if len(header_parts) < 4:
-        raise ThemeError(f"Invalid XPM header: {quoted_contents[0]!r}")
+        raise ThemeError(f"Invalid XPM header: {header!r}")
 
     try:
         _width = int(header_parts[0])
@@ -2096,7 +2216,23 @@ def extract_xpm_table(lines: list[str]) -> tuple[int, int, list[int], list[str]]
         colors = int(header_parts[2])
         cpp = int(header_parts[3])
     except ValueError as exc:
-        raise ThemeError(f"Non-numeric XPM header: {quoted_contents[0]!r}") from exc
+        raise ThemeError(f"Non-numeric XPM header: {header!r}") from exc
+
+    return height, colors, cpp
+
+
+def extract_xpm_table(text: str) -> tuple[int, int, list[tuple[int, int]], list[str]]:
+    quoted_spans: list[tuple[int, int]] = []
+    quoted_contents: list[str] = []
+
+    for match in QUOTED_LINE_RE.finditer(text):
+        quoted_spans.append(match.span("content"))
+        quoted_contents.append(match.group("content"))
+
+    if not quoted_contents:
+        raise ThemeError("No XPM data lines found.")
+
+    height, colors, cpp = parse_xpm_header(quoted_contents[0])
 
     expected_minimum = 1 + colors + height
     if len(quoted_contents) < expected_minimum:
@@ -2104,11 +2240,13 @@ def extract_xpm_table(lines: list[str]) -> tuple[int, int, list[int], list[str]]
             f"Incomplete XPM file: expected at least {expected_minimum} data lines, found {len(quoted_contents)}."
         )
 
-    return colors, cpp, quoted_indexes, quoted_contents
+    return colors, cpp, quoted_spans, quoted_contents
 
 
-def parse_color_definitions(contents: list[str], colors: int, cpp: int) -> dict[str, tuple[int, str, str]]:
-    definitions: dict[str, tuple[int, str, str]] = {}
+def parse_color_definitions(
+    contents: list[str], colors: int, cpp: int
+) -> dict[str, tuple[int, str, str, tuple[int, int] | None]]:
+    definitions: dict[str, tuple[int, str, str, tuple[int, int] | None]] = {}
 
     for offset in range(1, colors + 1):
         entry = contents[offset]
@@ -2118,52 +2256,63 @@ def parse_color_definitions(contents: list[str], colors: int, cpp: int) -> dict[
         rest = entry[cpp:]
         color_match = COLOR_VALUE_RE.search(rest)
         color_value = color_match.group(2).lower() if color_match else ""
-        definitions[symbol] = (offset, rest, color_value)
+        color_span = color_match.span(2) if color_match else None
+        definitions[symbol] = (offset, rest, color_value, color_span)
 
     return definitions
 
 
-def rewrite_quoted_line(original_line: str, new_content: str) -> str:
-    line_ending = "\n" if original_line.endswith("\n") else ""
-    stripped = original_line.rstrip("\n")
-    match = QUOTED_LINE_RE.match(stripped)
-    if not match:
-        raise ThemeError(f"Could not rewrite line: {original_line!r}")
-    return f"{match.group('prefix')}{new_content}{match.group('suffix')}{line_ending}"
+def splice_text(text: str, edits: list[tuple[int, int, str]]) -> str:
+    pieces: list[str] = []
+    position = 0
+    for start, end, replacement in sorted(edits):
+        pieces.append(text[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
 
 
-def update_xpm_file(path: Path, target_symbols: list[str], new_color: str) -> bool:
-    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
-    colors, cpp, quoted_indexes, quoted_contents = extract_xpm_table(lines)
+def update_xpm_file(path: Path, target_symbols: list[str], new_color: str, text: str | None = None) -> bool:
+    if text is None:
+        text = path.read_text(encoding="utf-8")
+    colors, cpp, quoted_spans, quoted_contents = extract_xpm_table(text)
     definitions = parse_color_definitions(quoted_contents, colors, cpp)
-    changed = False
+    # Changed entries are spliced into the original text by their spans.
+    edits: list[tuple[int, int, str]] = []
 
     for symbol in target_symbols:
         if symbol not in definitions:
             raise ThemeError(f"In {path.name}, remembered symbol {symbol!r} is missing.")
 
-        entry_offset, rest, _current_value = definitions[symbol]
-        updated_rest, replacements = COLOR_VALUE_RE.subn(rf'\1{new_color}', rest, count=1)
-        if replacements == 0:
+        entry_offset, rest, _current_value, color_span = definitions[symbol]
+        if color_span is None:
             raise ThemeError(f"In {path.name}, no 'c <color>' entry could be replaced for symbol {symbol!r}.")
 
-        new_entry = f"{symbol}{updated_rest}"
-        line_index = quoted_indexes[entry_offset]
-        current_line = lines[line_index]
-        current_content = quoted_contents[entry_offset]
-        if current_content != new_entry:
-            lines[line_index] = rewrite_quoted_line(current_line, new_entry)
+        # Splice at the span found while parsing instead of matching again.
+        start, end = color_span
+        new_entry = f"{symbol}{rest[:start]}{new_color}{rest[end:]}"
+        if quoted_contents[entry_offset] != new_entry:
+            start, end = quoted_spans[entry_offset]
+            edits.append((start, end, new_entry))
             quoted_contents[entry_offset] = new_entry
-            changed = True
 
-    if changed:
+    if edits:
         backup_file(path)
-        path.write_text("".join(lines), encoding="utf-8")
+        path.write_text(splice_text(text, edits), encoding="utf-8")
 
-    return changed
+    return bool(edits)
 
 
-def load_or_bootstrap_manifest(theme_root: Path, xpm_files: list[Path], original_target: str, manifest_name: str, css_relative_path: str) -> dict:
+def load_or_bootstrap_manifest(
+    theme_root: Path,
+    xpm_files: list[Path],
+    original_target: str,
+    target_re: re.Pattern[str],
+    manifest_name: str,
+    css_relative_path: str,
+    xpm_texts: dict[Path, str],
+) -> dict:
     manifest_path = theme_root / manifest_name
     if manifest_path.exists():
         with manifest_path.open("r", encoding="utf-8") as handle:
@@ -2179,13 +2328,18 @@ def load_or_bootstrap_manifest(theme_root: Path, xpm_files: list[Path], original
         "css_relative_path": css_relative_path,
     }
 
+    # Most XPMs never mention the marker color, so a single scan of the raw
+    # text is enough to skip them before any per-entry parsing happens.
     for xpm_path in xpm_files:
-        lines = xpm_path.read_text(encoding="utf-8").splitlines(keepends=True)
-        colors, cpp, _quoted_indexes, quoted_contents = extract_xpm_table(lines)
+        text = xpm_path.read_text(encoding="utf-8")
+        if not target_re.search(text):
+            continue
+        xpm_texts[xpm_path] = text
+        colors, cpp, _quoted_spans, quoted_contents = extract_xpm_table(text)
         definitions = parse_color_definitions(quoted_contents, colors, cpp)
         matching_symbols = [
             symbol
-            for symbol, (_offset, _rest, color_value) in definitions.items()
+            for symbol, (_offset, _rest, color_value, _span) in definitions.items()
             if color_value == original_target
         ]
         if matching_symbols:
@@ -2201,24 +2355,33 @@ def load_or_bootstrap_manifest(theme_root: Path, xpm_files: list[Path], original
     return manifest
 
 
-def update_css_file(css_path: Path, new_color: str, original_target: str) -> bool:
-    content = css_path.read_text(encoding="utf-8")
-    new_content, replacements = CSS_COLOR_BASE_RE.subn(rf'\1{new_color}\3', content, count=1)
-
-    if replacements == 0:
-        fallback = re.compile(re.escape(original_target), re.IGNORECASE)
-        new_content, replacements = fallback.subn(new_color, content, count=1)
-
-    if replacements == 0:
-        raise ThemeError(
-            f"Neither '@define-color color_base ...' nor the original color {original_target} was found in the CSS file."
-        )
-
-    if new_content != content:
-        backup_file(css_path)
-        css_path.write_text(new_content, encoding="utf-8")
-        return True
-    return False
+def update_css_file(css_path: Path, new_color: str, original_target: str, target_re: re.Pattern[str]) -> bool:
+    content = css_path.read_bytes().decode("utf-8")
+    match = CSS_COLOR_BASE_RE.search(content)
+    if match:
+        start, end = match.span(2)
+    else:
+        match = target_re.search(content)
+        if match is None:
+            raise ThemeError(
+                f"Neither '@define-color color_base ...' nor the original color {original_target} was found in the CSS file."
+            )
+        start, end = match.span()
+
+    if content[start:end] == new_color:
+        return False
+
+    backup_file(css_path)
+    old_bytes = content[start:end].encode("utf-8")
+    new_bytes = new_color.encode("utf-8")
+    if len(old_bytes) == len(new_bytes):
+        # Hex colors keep their length, so only the color bytes are rewritten.
+        with css_path.open("r+b") as handle:
+            handle.seek(len(content[:start].encode("utf-8")))
+            handle.write(new_bytes)
+    else:
+        css_path.write_bytes((content[:start] + new_color + content[end:]).encode("utf-8"))
+    return True
 
 
 def main() -> int:
@@ -2234,24 +2397,30 @@ def main() -> int:
 
     css_path = theme_root / css_relative_path
     xpm_dir = theme_root / xfwm4_dir_name
-    xpm_files = sorted(xpm_dir.glob("*.xpm"))
 
     if not css_path.is_file():
         raise ThemeError(f"CSS file not found: {css_path}")
     if not xpm_dir.is_dir():
         raise ThemeError(f"xfwm4 directory not found: {xpm_dir}")
+
+    xpm_files = list_xpm_files(xpm_dir)
     if not xpm_files:
         raise ThemeError(f"No XPM files found under: {xpm_dir}")
 
-    manifest = load_or_bootstrap_manifest(theme_root, xpm_files, original_target, manifest_name, str(css_relative_path))
+    target_re = compile_color_pattern(original_target)
+    # Filled while bootstrapping the manifest so those files are not read twice.
+    xpm_texts: dict[Path, str] = {}
+    manifest = load_or_bootstrap_manifest(
+        theme_root, xpm_files, original_target, target_re, manifest_name, str(css_relative_path), xpm_texts
+    )
     changed_files: list[str] = []
 
     for relative_path, symbols in sorted(manifest.get("xpm_symbols", {}).items()):
         xpm_path = theme_root / relative_path
-        if update_xpm_file(xpm_path, list(symbols), new_color):
+        if update_xpm_file(xpm_path, list(symbols), new_color, xpm_texts.get(xpm_path)):
             changed_files.append(relative_path)
 
-    if update_css_file(css_path, new_color, original_target):
+    if update_css_file(css_path, new_color, original_target, target_re):
         changed_files.append(str(css_path.relative_to(theme_root)))
 
     print(f"MANIFEST={theme_root / manifest_name}")
@@ -2281,11 +2450,20 @@ PY
     return 1
   fi
 
-  LAST_APPLY_MANIFEST=$(sed -n 's/^MANIFEST=//p' "$tmp_stdout" | tail -n1)
-  LAST_APPLY_THEME_COLOR=$(sed -n 's/^COLOR=//p' "$tmp_stdout" | tail -n1)
-  LAST_APPLY_THEME_ROOT=$(sed -n 's/^THEME_ROOT=//p' "$tmp_stdout" | tail -n1)
-  LAST_APPLY_COLOR_FILES=$(sed -n 's/^FILES=//p' "$tmp_stdout" | tail -n1)
-  LAST_APPLY_COLOR_MESSAGE=$(sed -n 's/^MESSAGE=//p' "$tmp_stdout" | tail -n1)
+  LAST_APPLY_MANIFEST=""
+  LAST_APPLY_THEME_COLOR=""
+  LAST_APPLY_THEME_ROOT=""
+  while IFS= read -r line || [[ -n "$line" ]]; do
+    case "$line" in
+      MANIFEST=*) LAST_APPLY_MANIFEST="${line#MANIFEST=}" ;;
+      COLOR=*) LAST_APPLY_THEME_COLOR="${line#COLOR=}" ;;
+      THEME_ROOT=*) LAST_APPLY_THEME_ROOT="${line#THEME_ROOT=}" ;;
+      FILES=*) LAST_APPLY_COLOR_FILES="${line#FILES=}" ;;
+      MESSAGE=*) LAST_APPLY_COLOR_MESSAGE="${line#MESSAGE=}" ;;
+    esac
+  done < "$tmp_stdout"
+  APPLIED_THEME_ROOT="$theme_root"
+  APPLIED_THEME_COLOR="$new_color"
 
   rm -f "$tmp_stdout" "$tmp_stderr"
   return 0
@@ -2317,7 +2495,9 @@ create_backup_file() {
   local backup_path="${file_path}.bak"
 
   if [[ ! -f "$backup_path" ]]; then
-    cp -p -- "$file_path" "$backup_path" || return 1
+    # Clone on CoW filesystems; plain copy where reflink is unsupported.
+    cp --reflink=auto -p -- "$file_path" "$backup_path" 2>/dev/null \
+      || cp -p -- "$file_path" "$backup_path" || return 1
   fi
 
   return 0
@@ -2396,12 +2576,12 @@ update_panel_xml_menu_opacity() {
   temp_file=$(mktemp) || return 1
   if sed -E "0,/(<property name=\"menu-opacity\" type=\"int\" value=\")[0-9]+(\"\\/>)/s//\\1${opacity_percent}\\2/" "$xml_file" > "$temp_file"; then
     if cmp -s "$xml_file" "$temp_file"; then
-      if ! grep -q '<property name="menu-opacity" type="int" value="' "$xml_file"; then
-        rm -f "$temp_file"
-        return 1
-      fi
+      rm -f "$temp_file"
+      grep -q '<property name="menu-opacity" type="int" value="' "$xml_file"
+      return
     fi
     mv "$temp_file" "$xml_file"
+    LAST_APPLY_TRANSPARENCY_CHANGED=1
     return 0
   fi
 
@@ -2452,7 +2632,13 @@ update_panel_css_opacity() {
       }
     }
   ' "$css_file" > "$temp_file"; then
-    mv "$temp_file" "$css_file"
+    # Leave the file (and its mtime) alone when nothing changed.
+    if cmp -s "$css_file" "$temp_file"; then
+      rm -f "$temp_file"
+    else
+      mv "$temp_file" "$css_file"
+      LAST_APPLY_TRANSPARENCY_CHANGED=1
+    fi
     return 0
   fi
 
@@ -2505,7 +2691,12 @@ update_whiskermenu_rc_menu_opacity() {
       }
     }
   ' "$rc_file" > "$temp_file"; then
-    mv "$temp_file" "$rc_file"
+    if cmp -s "$rc_file" "$temp_file"; then
+      rm -f "$temp_file"
+    else
+      mv "$temp_file" "$rc_file"
+      LAST_APPLY_TRANSPARENCY_CHANGED=1
+    fi
     return 0
   fi
 
@@ -2513,17 +2704,33 @@ update_whiskermenu_rc_menu_opacity() {
   return 1
 }
 
-collect_menu_opacity_xfconf_paths() {
+load_panel_xfconf_listing() {
   command -v xfconf-query >/dev/null 2>&1 || return 1
 
+  local line path value
+
+  PANEL_XFCONF_LISTING=$(xfconf-query -c xfce4-panel -l -v 2>/dev/null || true)
+  PANEL_XFCONF_VALUES=()
+  while IFS= read -r line; do
+    path="${line%%[[:space:]]*}"
+    [[ -n "$path" ]] || continue
+    value="${line#"$path"}"
+    value="${value#"${value%%[![:space:]]*}"}"
+    PANEL_XFCONF_VALUES["$path"]="$value"
+  done <<< "$PANEL_XFCONF_LISTING"
+  [[ -n "$PANEL_XFCONF_LISTING" ]]
+}
+
+collect_menu_opacity_xfconf_paths() {
   local line
+  local path
   local -a paths=()
 
   while IFS= read -r line; do
-    [[ -n "$line" ]] || continue
-    [[ "$line" == /plugins/plugin-*/menu-opacity ]] || continue
-    paths+=("$line")
-  done < <(xfconf-query -c xfce4-panel -l 2>/dev/null || true)
+    path="${line%%[[:space:]]*}"
+    [[ "$path" == /plugins/plugin-*/menu-opacity ]] || continue
+    paths+=("$path")
+  done <<< "$PANEL_XFCONF_LISTING"
 
   (( ${#paths[@]} > 0 )) || return 1
   printf '%s
@@ -2532,8 +2739,6 @@ collect_menu_opacity_xfconf_paths() {
 }
 
 collect_whiskermenu_xfconf_plugin_ids() {
-  command -v xfconf-query >/dev/null 2>&1 || return 1
-
   local line
   local path
   local plugin_id
@@ -2541,17 +2746,14 @@ collect_whiskermenu_xfconf_plugin_ids() {
 
   while IFS= read -r line; do
     [[ "$line" == /plugins/plugin-* ]] || continue
-    if printf '%s
-' "$line" | grep -qi 'whiskermenu'; then
-      path=$(printf '%s
-' "$line" | awk '{print $1}')
-      plugin_id="${path#/plugins/plugin-}"
-      plugin_id="${plugin_id%%/*}"
-      if [[ "$plugin_id" =~ ^[0-9]+$ ]]; then
-        ids+=("$plugin_id")
-      fi
+    [[ "${line,,}" == *whiskermenu* ]] || continue
+    path="${line%%[[:space:]]*}"
+    plugin_id="${path#/plugins/plugin-}"
+    plugin_id="${plugin_id%%/*}"
+    if [[ "$plugin_id" =~ ^[0-9]+$ ]]; then
+      ids+=("$plugin_id")
     fi
-  done < <(xfconf-query -c xfce4-panel -p /plugins -l -v 2>/dev/null || xfconf-query -c xfce4-panel -l -v 2>/dev/null || true)
+  done <<< "$PANEL_XFCONF_LISTING"
 
   (( ${#ids[@]} > 0 )) || return 1
   printf '%s
@@ -2575,30 +2777,57 @@ update_whiskermenu_xfconf_menu_opacity() {
   local opacity_percent="$2"
   local property="/plugins/plugin-${plugin_id}/menu-opacity"
 
-  update_xfconf_menu_opacity_path "$property" "$opacity_percent"
+  command -v xfconf-query >/dev/null 2>&1 || return 2
+
+  # Only reached when the listing had no menu-opacity for this plugin, so a
+  # plain -s would always fail first; create the property directly.
+  xfconf-query -c xfce4-panel -p "$property" -n -t int -s "$opacity_percent" >/dev/null 2>&1
 }
 
 update_all_whiskermenu_xfconf_opacity() {
   local opacity_percent="$1"
   local property_path
   local plugin_id
+  local pid
+  local failed=0
+  local wrote=0
   local -a updated_paths=()
+  local -a pids=()
+
+  # One listing (with values) serves both lookups below.
+  load_panel_xfconf_listing || return 2
 
+  # The writes are independent, so run them side by side and collect the
+  # results afterwards; properties already at the target value are skipped.
   while IFS= read -r property_path; do
     [[ -n "$property_path" ]] || continue
-    update_xfconf_menu_opacity_path "$property_path" "$opacity_percent" || return 1
+    if [[ "${PANEL_XFCONF_VALUES["$property_path"]-}" != "$opacity_percent" ]]; then
+      update_xfconf_menu_opacity_path "$property_path" "$opacity_percent" &
+      pids+=("$!")
+    fi
     updated_paths+=("$property_path")
   done < <(collect_menu_opacity_xfconf_paths || true)
 
   if (( ${#updated_paths[@]} == 0 )); then
     while IFS= read -r plugin_id; do
       [[ -n "$plugin_id" ]] || continue
-      update_whiskermenu_xfconf_menu_opacity "$plugin_id" "$opacity_percent" || return 1
+      update_whiskermenu_xfconf_menu_opacity "$plugin_id" "$opacity_percent" &
+      pids+=("$!")
       updated_paths+=("/plugins/plugin-${plugin_id}/menu-opacity")
     done < <(collect_whiskermenu_xfconf_plugin_ids || true)
   fi
 
-  (( ${#updated_paths[@]} > 0 )) || return 1
+  for pid in "${pids[@]}"; do
+    if wait "$pid"; then
+      wrote=1
+    else
+      failed=1
+    fi
+  done
+  (( ! wrote )) || LAST_APPLY_TRANSPARENCY_CHANGED=1
+
+  (( ${#updated_paths[@]} > 0 )) || return 2
+  (( ! failed )) || return 1
 
   local joined=""
   local idx
@@ -2623,7 +2852,7 @@ update_all_whiskermenu_rc_opacity() {
     updated_files+=("$file")
   done < <(collect_whiskermenu_rc_files)
 
-  (( ${#updated_files[@]} > 0 )) || return 1
+  (( ${#updated_files[@]} > 0 )) || return 2
 
   local joined=""
   local idx
@@ -2648,12 +2877,12 @@ update_picom_frame_opacity() {
   temp_file=$(mktemp) || return 1
   if sed -E "0,/^([[:space:]]*frame-opacity[[:space:]]*=[[:space:]]*)[0-9]+(\.[0-9]+)?([[:space:]]*;.*)$/s//\1${opacity_decimal}\3/" "$picom_file" > "$temp_file"; then
     if cmp -s "$picom_file" "$temp_file"; then
-      if ! grep -Eq '^[[:space:]]*frame-opacity[[:space:]]*=[[:space:]]*[0-9]+(\.[0-9]+)?[[:space:]]*;' "$picom_file"; then
-        rm -f "$temp_file"
-        return 1
-      fi
+      rm -f "$temp_file"
+      grep -Eq '^[[:space:]]*frame-opacity[[:space:]]*=[[:space:]]*[0-9]+(\.[0-9]+)?[[:space:]]*;' "$picom_file"
+      return
     fi
     mv "$temp_file" "$picom_file"
+    LAST_APPLY_TRANSPARENCY_CHANGED=1
     return 0
   fi
 
@@ -2668,6 +2897,8 @@ apply_transparency_files() {
   local panel_xml_updated=0
   local whisker_rc_updated=0
   local whisker_xfconf_updated=0
+  local target_failed=0
+  local rc
 
   LAST_APPLY_MESSAGE=""
   LAST_APPLY_PANEL_XML="$PANEL_XML_FILE"
@@ -2678,6 +2909,7 @@ apply_transparency_files() {
   LAST_APPLY_MENU_OPACITY=""
   LAST_APPLY_PANEL_ALPHA=""
   LAST_APPLY_FRAME_OPACITY=""
+  LAST_APPLY_TRANSPARENCY_CHANGED=0
 
   if [[ ! -f "$PICOM_CONFIG_FILE" ]]; then
     LAST_APPLY_MESSAGE="Picom config not found: $PICOM_CONFIG_FILE"
@@ -2692,18 +2924,39 @@ apply_transparency_files() {
   opacity_percent=$(get_panel_opacity_percent "$transparency" "$intensity")
   opacity_decimal=$(format_opacity_decimal "$opacity_percent")
 
+  if [[ "$css_file" == "$APPLIED_PANEL_CSS" && "$opacity_percent" == "$APPLIED_MENU_OPACITY" ]]; then
+    LAST_APPLY_PANEL_CSS="$css_file"
+    LAST_APPLY_MENU_OPACITY="$opacity_percent"
+    LAST_APPLY_PANEL_ALPHA="$opacity_decimal"
+    LAST_APPLY_FRAME_OPACITY="$opacity_decimal"
+    LAST_APPLY_MESSAGE="No transparency changes needed. Menu opacity already ${opacity_percent}."
+    return 0
+  fi
+
   if [[ -f "$PANEL_XML_FILE" ]]; then
     if update_panel_xml_menu_opacity "$PANEL_XML_FILE" "$opacity_percent"; then
       panel_xml_updated=1
+    else
+      target_failed=1
     fi
   fi
 
-  if update_all_whiskermenu_xfconf_opacity "$opacity_percent"; then
+  # Return code 2 means there was nothing to update (no xfconf plugins or no
+  # rc files); only real failures keep the result out of the cache below.
+  update_all_whiskermenu_xfconf_opacity "$opacity_percent"
+  rc=$?
+  if (( rc == 0 )); then
     whisker_xfconf_updated=1
+  elif (( rc == 1 )); then
+    target_failed=1
   fi
 
-  if update_all_whiskermenu_rc_opacity "$opacity_percent"; then
+  update_all_whiskermenu_rc_opacity "$opacity_percent"
+  rc=$?
+  if (( rc == 0 )); then
     whisker_rc_updated=1
+  elif (( rc == 1 )); then
+    target_failed=1
   fi
 
   if (( ! panel_xml_updated && ! whisker_xfconf_updated && ! whisker_rc_updated )); then
@@ -2725,6 +2978,13 @@ apply_transparency_files() {
   LAST_APPLY_MENU_OPACITY="$opacity_percent"
   LAST_APPLY_PANEL_ALPHA="$opacity_decimal"
   LAST_APPLY_FRAME_OPACITY="$opacity_decimal"
+  if (( target_failed )); then
+    APPLIED_PANEL_CSS=""
+    APPLIED_MENU_OPACITY=""
+  else
+    APPLIED_PANEL_CSS="$css_file"
+    APPLIED_MENU_OPACITY="$opacity_percent"
+  fi
   LAST_APPLY_MESSAGE="Applied menu-opacity=${opacity_percent} via xfconf property update, panel XML/Whisker rc sync, panel alpha=${opacity_decimal} and frame-opacity=${opacity_decimal}."
 
   return 0
@@ -2764,39 +3024,39 @@ restart_xfwm4() {
   return 0
 }
 
+# True when the last color/transparency apply wrote anything; otherwise the
+# panel and xfwm4 already show the current state and need no restart.
+last_apply_changed_files() {
+  [[ -n "$LAST_APPLY_COLOR_FILES" ]] || (( LAST_APPLY_TRANSPARENCY_CHANGED ))
+}
+
 restart_xfce_components() {
   local panel_rc=0
   local xfwm_rc=0
 
-  LAST_RESTART_MESSAGE=""
-  LAST_RESTART_PANEL_STATUS=""
-  LAST_RESTART_XFWM_STATUS=""
-
   restart_xfce4_panel
   panel_rc=$?
-  case "$panel_rc" in
-    0) LAST_RESTART_PANEL_STATUS="restarted via xfce4-panel -r or full restart fallback" ;;
-    1) LAST_RESTART_PANEL_STATUS="restart failed" ;;
-    2) LAST_RESTART_PANEL_STATUS="xfce4-panel not found" ;;
-    *) LAST_RESTART_PANEL_STATUS="unknown error (${panel_rc})" ;;
-  esac
 
   restart_xfwm4
   xfwm_rc=$?
-  case "$xfwm_rc" in
-    0) LAST_RESTART_XFWM_STATUS="restarted via xfwm4 --replace" ;;
-    1) LAST_RESTART_XFWM_STATUS="restart failed" ;;
-    2) LAST_RESTART_XFWM_STATUS="xfwm4 not found" ;;
-    *) LAST_RESTART_XFWM_STATUS="unknown error (${xfwm_rc})" ;;
-  esac
 
-  if (( panel_rc == 0 && xfwm_rc == 0 )); then
-    LAST_RESTART_MESSAGE="Restarted xfce4-panel and xfwm4."
-    return 0
+  (( panel_rc == 0 && xfwm_rc == 0 ))
+}
+
+# The restart sleeps add up to about a second; run it in the background so the
+# UI can redraw right away. A still-running restart is waited for first so two
+# never overlap.
+wait_for_restart() {
+  if [[ -n "${RESTART_PID:-}" ]]; then
+    wait "$RESTART_PID" 2>/dev/null || true
+    RESTART_PID=""
   fi
+}
 
-  LAST_RESTART_MESSAGE="Restart warning: panel=${LAST_RESTART_PANEL_STATUS}; xfwm4=${LAST_RESTART_XFWM_STATUS}."
-  return 1
+start_restart_xfce_components() {
+  wait_for_restart
+  restart_xfce_components >/dev/null 2>&1 &
+  RESTART_PID=$!
 }
 
 run_save_action() {
@@ -2813,8 +3073,8 @@ run_save_action() {
     transparency_apply_ok=1
   fi
 
-  if (( color_apply_ok || transparency_apply_ok )); then
-    restart_xfce_components >/dev/null 2>&1 || true
+  if (( color_apply_ok || transparency_apply_ok )) && last_apply_changed_files; then
+    start_restart_xfce_components
   fi
 
   if (( color_apply_ok && transparency_apply_ok )); then
@@ -2842,8 +3102,8 @@ run_cancel_action() {
     transparency_apply_ok=1
   fi
 
-  if (( color_apply_ok || transparency_apply_ok )); then
-    restart_xfce_components >/dev/null 2>&1 || true
+  if (( color_apply_ok || transparency_apply_ok )) && last_apply_changed_files; then
+    start_restart_xfce_components
   fi
 
   if (( color_apply_ok && transparency_apply_ok )); then
@@ -2860,6 +3120,7 @@ run_cancel_action() {
 # -----------------------------
 load_config
 set_language_metrics
+index_preset_values
 update_palette_colors
 initialize_saved_and_working_state
 auto_resize_message="$(tr_text not_run_yet)"
@@ -2876,6 +3137,12 @@ while true; do
   render
   key=$(read_key) || break
   apply_action "$key" && break
+  # Apply keys that queued up meanwhile (held arrows, fast typing) before
+  # drawing again, so a burst of input costs one frame instead of one each.
+  while read -t 0; do
+    key=$(read_key) || break 2
+    apply_action "$key" && break 2
+  done
 done
 
 cleanup